@@ -0,0 +1,29 @@
+# app/api/deps.py
+import asyncio
+import aiohttp
+from fastapi import Request
+
+from app.core.http_client import get_http_session
+from app.services.ocr_service import ImageInput, ocr_bytes
+
+
+def get_http_client(request: Request) -> aiohttp.ClientSession:
+    """
+    Shared aiohttp session created in the application lifespan.
+    """
+    session = getattr(request.app.state, "http", None)
+    if session is None or session.closed:
+        session = get_http_session()
+    return session
+
+
+async def run_ocr(request: Request, img_b: ImageInput):
+    """
+    Run OCR on the app's OCR process pool, or in a thread when no pool is configured.
+    """
+    pool = getattr(request.app.state, "ocr_pool", None)
+    if pool is None:
+        return await asyncio.to_thread(ocr_bytes, img_b)
+    if isinstance(img_b, memoryview):
+        img_b = img_b.tobytes()  # memoryviews can't be pickled to the worker
+    return await asyncio.get_running_loop().run_in_executor(pool, ocr_bytes, img_b)
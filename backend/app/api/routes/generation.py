@@ -1,12 +1,22 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import FileResponse
 from pydantic import BaseModel, Field
 from typing import Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 import os
 import asyncio
-from app.services.generation_service import generate_image
+from app.services.generation_service import ensure_pipe_async, generate_image
 
 router = APIRouter(prefix="/api", tags=["generation"])
 
+# One worker per GPU so concurrent generations don't compete for VRAM
+GEN_WORKERS = int(os.environ.get("GEN_WORKERS", "1"))
+_GEN_EXECUTOR = ThreadPoolExecutor(max_workers=GEN_WORKERS, thread_name_prefix="gen")
+# Only hand the executor as many jobs as it can run; other requests wait here,
+# so requests cancelled while waiting never reach the GPU
+_gen_semaphore = asyncio.Semaphore(GEN_WORKERS)
+
 
 class GenRequest(BaseModel):
     prompt: str = Field(..., min_length=1, max_length=1000, description="Image generation prompt")
@@ -19,16 +29,31 @@ class GenResponse(BaseModel):
 
 
 @router.post("/generate", response_model=GenResponse)
-async def generate(req: GenRequest):
-    loop = asyncio.get_event_loop()
-    # Run CPU/GPU intensive generation in executor to avoid blocking
-    result: Dict[str, Any] = await loop.run_in_executor(None, generate_image, req.prompt)
-
-    if not result.get("success") or not result.get("image_path") or not os.path.exists(result["image_path"]):
+async def generate(
+    req: GenRequest,
+    as_file: bool = Query(False, description="Return the PNG directly instead of a URL")
+):
+    # Load the pipeline without tying up a generation worker or the event loop
+    try:
+        await ensure_pipe_async()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    # Run CPU/GPU intensive generation in the dedicated executor to avoid blocking
+    async with _gen_semaphore:
+        result: Dict[str, Any] = await asyncio.get_running_loop().run_in_executor(
+            _GEN_EXECUTOR, generate_image, req.prompt
+        )
+
+    image_path = Path(result["image_path"]) if result.get("success") and result.get("image_path") else None
+    if image_path is None or not image_path.is_file():
         raise HTTPException(status_code=500, detail=result.get("error", "Image generation failed"))
 
+    # Send the file straight from disk (sendfile where supported)
+    if as_file:
+        return FileResponse(image_path, media_type="image/png", filename=image_path.name)
+
     # Convert absolute path to relative URL
-    filename = os.path.basename(result["image_path"])
-    image_url = f"/static/images/{filename}"
+    image_url = f"/static/images/{image_path.name}"
 
-    return GenResponse(prompt=req.prompt, image_url=image_url)
\ No newline at end of file
+    return GenResponse(prompt=req.prompt, image_url=image_url)
@@ -1,20 +1,28 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from typing import Dict, Any
+import asyncio
 import logging
-import aiohttp
+from app.api.deps import run_ocr
+from app.core.config import get_settings
 from app.models.schemas import VQARequest, VQAResponse
-from app.services.analysis_service import caption_from_url, answer_from_context
-from app.services.ocr_service import ocr_bytes
+from app.services.analysis_service import (
+    answer_from_context,
+    caption_from_bytes,
+    caption_from_url,
+    fetch_image_bytes,
+)
 from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Body
 from typing import Optional
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+settings = get_settings()
+
 router = APIRouter(prefix="/api", tags=["analysis"])
 
 @router.post("/vqa", response_model=VQAResponse)
-async def vqa(req: VQARequest):
+async def vqa(req: VQARequest, request: Request):
     """
     Visual Question Answering endpoint.
     Combines image captioning, OCR, and question answering.
@@ -29,75 +37,52 @@ async def vqa(req: VQARequest):
         
         logger.info(f"VQA request for image: {req.image_url}, question: {req.question}")
         
-        # 1) Generate caption for the image
+        # 1) Download the image once for both captioning and OCR
         try:
-            caption = await caption_from_url(req.image_url)
-            logger.info(f"Generated caption: {caption}")
-        except Exception as e:
-            logger.error(f"Caption generation failed: {e}")
-            raise HTTPException(status_code=400, detail=f"Failed to generate caption: {str(e)}")
+            img_bytes = await fetch_image_bytes(req.image_url)
+        except ValueError as e:
+            logger.warning(f"Failed to fetch image: {e}")
+            raise HTTPException(status_code=400, detail=str(e))
+        
+        # 2) Generate caption and perform OCR concurrently
+        caption, ocr_result = await asyncio.gather(
+            caption_from_bytes(img_bytes),
+            run_ocr(request, img_bytes),
+            return_exceptions=True
+        )
+        
+        if isinstance(caption, Exception):
+            logger.error(f"Caption generation failed: {caption}")
+            raise HTTPException(status_code=400, detail=f"Failed to generate caption: {str(caption)}")
+        logger.info(f"Generated caption: {caption}")
         
-        # 2) Download image and perform OCR
         ocr_text = ""
-        try:
-            timeout = aiohttp.ClientTimeout(total=30)
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.get(req.image_url) as response:
-                    if response.status != 200:
-                        logger.warning(f"Failed to fetch image: HTTP {response.status}")
-                        raise HTTPException(
-                            status_code=400, 
-                            detail=f"Unable to fetch image from URL (HTTP {response.status})"
-                        )
-                    
-                    # Check content type
-                    content_type = response.headers.get('content-type', '').lower()
-                    if not content_type.startswith('image/'):
-                        raise HTTPException(
-                            status_code=400,
-                            detail=f"URL does not point to an image. Content-Type: {content_type}"
-                        )
-                    
-                    img_bytes = await response.read()
-                    
-            # Perform OCR
-            ocr_text, tables = ocr_bytes(img_bytes)  # Fixed syntax error here
-            logger.info(f"OCR extracted {len(ocr_text)} characters")
-            
-        except HTTPException:
-            raise
-        except Exception as e:
-            logger.error(f"OCR processing failed: {e}")
+        if isinstance(ocr_result, Exception):
+            logger.error(f"OCR processing failed: {ocr_result}")
             # Don't fail the entire request if OCR fails
-            ocr_text = ""
             logger.warning("Continuing without OCR text due to processing error")
+        else:
+            ocr_text, tables = ocr_result
+            logger.info(f"OCR extracted {len(ocr_text)} characters")
         
-        # 3) Build context from multiple sources
-        context_parts = []
-        
-        # Always include caption
-        if caption and caption.strip():
-            context_parts.append(f"Image description: {caption}")
-        
-        # Include OCR text if available
-        if ocr_text and ocr_text.strip():
-            context_parts.append(f"Text visible in image: {ocr_text}")
-        
-        # Include user hint if provided
-        if req.ocr_text_hint and req.ocr_text_hint.strip():
-            context_parts.append(f"Additional context: {req.ocr_text_hint}")
+        # 3) Build context from multiple sources (caption, OCR text, user hint)
+        hint = req.ocr_text_hint.strip() if req.ocr_text_hint else ""
+        context_parts = [
+            part for part in (
+                f"Image description: {caption}" if caption and caption.strip() else None,
+                f"Text visible in image: {ocr_text}" if ocr_text else None,
+                f"Additional context: {hint}" if hint else None,
+            ) if part
+        ]
         
         # Combine all context
-        context = "\n".join(context_parts)
-        
-        if not context.strip():
-            context = "No visual information could be extracted from the image."
+        context = "\n".join(context_parts) or "No visual information could be extracted from the image."
         
         logger.info(f"Built context with {len(context)} characters")
         
         # 4) Answer question using the context
         try:
-            answer, confidence_score = answer_from_context(req.question, context)
+            answer, confidence_score = await asyncio.to_thread(answer_from_context, req.question, context)
             logger.info(f"Generated answer: {answer}, confidence: {confidence_score}")
         except Exception as e:
             logger.error(f"Question answering failed: {e}")
@@ -124,7 +109,7 @@ async def vqa(req: VQARequest):
             caption=caption,
             answer=answer,
             confidence=confidence_score,
-            context_used=context,
+            context_used=context if req.return_context else None,
             sources=sources
         )
         
@@ -139,6 +124,7 @@ async def vqa(req: VQARequest):
     
 @router.post("/ocr")
 async def image_ocr(
+    request: Request,
     file: Optional[UploadFile] = File(None),
     image_url: Optional[str] = Form(None)
 ):
@@ -152,27 +138,30 @@ async def image_ocr(
 
         img_bytes = None
 
-        # 1) If file provided, read it
+        # 1) If file provided, read it in chunks up to the upload limit
         if file:
-            content = await file.read()
-            if not content:
+            buf = bytearray()
+            while chunk := await file.read(1 << 20):
+                buf.extend(chunk)
+                if len(buf) > settings.MAX_UPLOAD_SIZE:
+                    raise HTTPException(
+                        413,
+                        detail=f"Image exceeds the {settings.MAX_UPLOAD_SIZE // (1024 * 1024)}MB upload limit"
+                    )
+            if not buf:
                 raise HTTPException(status_code=400, detail="Uploaded file is empty")
-            img_bytes = content
+            # bytearray is read in place by the decoder and pickles as-is to the OCR pool
+            img_bytes = buf
 
-        # 2) Else fetch from image_url
+        # 2) Else fetch from image_url (streamed, with the same size limit)
         elif image_url:
-            timeout = aiohttp.ClientTimeout(total=30)
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.get(image_url) as resp:
-                    if resp.status != 200:
-                        raise HTTPException(status_code=400, detail=f"Failed to fetch image (HTTP {resp.status})")
-                    content_type = resp.headers.get("content-type", "").lower()
-                    if not content_type.startswith("image/"):
-                        raise HTTPException(status_code=400, detail=f"URL does not point to an image. Content-Type: {content_type}")
-                    img_bytes = await resp.read()
+            try:
+                img_bytes = await fetch_image_bytes(image_url)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
 
         # 3) Run OCR
-        text, tables = ocr_bytes(img_bytes)
+        text, tables = await run_ocr(request, img_bytes)
 
         return {
             "ok": True,
@@ -220,7 +209,7 @@ async def answer_question(question: str, context: str):
         if not context or not context.strip():
             raise HTTPException(status_code=400, detail="context is required")
         
-        answer, confidence = answer_from_context(question, context)
+        answer, confidence = await asyncio.to_thread(answer_from_context, question, context)
         
         return {
             "question": question,
@@ -1,15 +1,44 @@
 from fastapi import APIRouter, UploadFile, File, HTTPException
-from fastapi.responses import FileResponse
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+from typing import AsyncIterator
+import asyncio
+import contextlib
+import io
 import tempfile
-import shutil
+import zipfile
 import os
 import logging
-from app.services.pdf_service import extract_tables_from_pdf, download_csv_files
+import aiofiles
+from app.core.config import get_settings
+from app.services.pdf_service import extract_tables_to_zip
 
 logger = logging.getLogger(__name__)
 
+settings = get_settings()
+
 router = APIRouter(prefix="/api", tags=["pdf"])
 
+
+async def _iter_buffer(buffer: io.BytesIO, chunk_size: int = 64 * 1024) -> AsyncIterator[bytes]:
+    """
+    Yield an in-memory buffer in fixed-size chunks. Async so StreamingResponse
+    iterates it on the event loop instead of hopping to a thread per chunk.
+    """
+    view = buffer.getbuffer()
+    try:
+        for start in range(0, len(view), chunk_size):
+            yield bytes(view[start:start + chunk_size])
+    finally:
+        view.release()
+
+
+def _cleanup(pdf_path: str):
+    """Remove the uploaded PDF."""
+    with contextlib.suppress(FileNotFoundError):
+        os.remove(pdf_path)
+
+
 @router.post("/ocr-pdf")
 async def ocr_pdf(file: UploadFile = File(...)):
     """
@@ -19,36 +48,46 @@ async def ocr_pdf(file: UploadFile = File(...)):
         raise HTTPException(400, detail="Upload a PDF file")
 
     tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".pdf")
+    tmp.close()
 
     try:
-        # Save uploaded file
-        with open(tmp.name, "wb") as f:
-            shutil.copyfileobj(file.file, f)
+        # Save uploaded file in chunks without blocking the event loop,
+        # rejecting oversized uploads before they are fully buffered
+        size = 0
+        async with aiofiles.open(tmp.name, "wb") as out:
+            while chunk := await file.read(1 << 20):
+                size += len(chunk)
+                if size > settings.MAX_UPLOAD_SIZE:
+                    raise HTTPException(
+                        413,
+                        detail=f"PDF exceeds the {settings.MAX_UPLOAD_SIZE // (1024 * 1024)}MB upload limit"
+                    )
+                await out.write(chunk)
 
-        # Extract tables → returns list of dicts with csv_path
-        csvs = extract_tables_from_pdf(tmp.name)
+        # Extract tables and encode them as CSV straight into an in-memory ZIP
+        # (stored, not deflated: the archive is streamed straight to the client)
+        buffer = io.BytesIO()
+        tables = await asyncio.to_thread(
+            extract_tables_to_zip, tmp.name, buffer, compression=zipfile.ZIP_STORED
+        )
 
-        if not csvs:
+        if not tables:
             raise HTTPException(404, detail="No tables found in the PDF")
 
-        # Bundle extracted CSVs into a ZIP
-        zip_path = download_csv_files(csvs)
-
-        logger.info(f"Extracted {len(csvs)} tables, packaged at {zip_path}")
+        logger.info(f"Extracted {len(tables)} tables, streaming {buffer.getbuffer().nbytes} byte ZIP")
 
-        # Return ZIP file as download response
-        return FileResponse(
-            path=zip_path,
-            filename="extracted_tables.zip",
-            media_type="application/zip"
+        # Stream the ZIP; the uploaded PDF is removed once the response is sent
+        return StreamingResponse(
+            _iter_buffer(buffer),
+            media_type="application/zip",
+            headers={"Content-Disposition": 'attachment; filename="extracted_tables.zip"'},
+            background=BackgroundTask(_cleanup, tmp.name)
         )
 
     except HTTPException:
+        _cleanup(tmp.name)
         raise
     except Exception as e:
+        _cleanup(tmp.name)
         logger.error(f"Error processing PDF: {e}")
         raise HTTPException(500, detail=f"Error processing PDF: {str(e)}")
-    finally:
-        tmp.close()
-        if os.path.exists(tmp.name):
-            os.unlink(tmp.name)
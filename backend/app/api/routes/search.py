@@ -1,20 +1,26 @@
 # app/api/routes/search.py
-from fastapi import APIRouter
+import aiohttp
+from fastapi import APIRouter, Depends
 from typing import List
+from app.api.deps import get_http_client
 from app.services.image_search import search_images
 from app.models.schemas import SearchRequest, SearchResponse, ImageItem
 
 router = APIRouter(prefix="/api", tags=["search"])
 
 @router.post("/search", response_model=SearchResponse)
-async def search_endpoint(request: SearchRequest):
+async def search_endpoint(
+    request: SearchRequest,
+    session: aiohttp.ClientSession = Depends(get_http_client)
+):
     """
     Search images from multiple providers (Unsplash, DuckDuckGo).
     """
     results = await search_images(
         q=request.q,
         limit=request.limit,
-        license_filter=request.license
+        license_filter=request.license,
+        session=session
     )
 
     items: List[ImageItem] = [ImageItem(**r) for r in results]
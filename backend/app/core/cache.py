@@ -0,0 +1,117 @@
+# app/core/cache.py
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+from app.core.config import get_settings
+
+try:
+    import redis.asyncio as aioredis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """
+    TTL cache for JSON-serializable responses with a stale fallback.
+
+    Entries are fresh for `ttl` seconds and kept for `stale_ttl` seconds so the
+    last good value can be served when the upstream call fails. Uses Redis when
+    REDIS_URL is configured (shared across workers), otherwise a per-process
+    in-memory LRU.
+    """
+
+    def __init__(self, namespace: str, ttl: int, stale_ttl: int, maxsize: int = 1024):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.stale_ttl = max(stale_ttl, ttl)
+        self.maxsize = maxsize
+        self._local: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+    def _key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    async def get(self, key: str) -> Tuple[Optional[Any], bool]:
+        """
+        Return (value, is_fresh). value is None on a miss.
+        """
+        entry = None
+        redis = get_redis()
+        if redis is not None:
+            try:
+                raw = await redis.get(self._key(key))
+                if raw is not None:
+                    entry = json.loads(raw)
+            except Exception as e:
+                logger.warning(f"Redis cache read failed: {e}")
+        else:
+            entry = self._local.get(key)
+            if entry is not None:
+                self._local.move_to_end(key)
+
+        if entry is None:
+            return None, False
+        stored_at, value = entry
+        age = time.time() - stored_at
+        if age > self.stale_ttl:
+            return None, False
+        return value, age <= self.ttl
+
+    async def set(self, key: str, value: Any):
+        entry = (time.time(), value)
+        redis = get_redis()
+        if redis is not None:
+            try:
+                await redis.set(self._key(key), json.dumps(entry), ex=self.stale_ttl)
+            except Exception as e:
+                logger.warning(f"Redis cache write failed: {e}")
+            return
+        self._local[key] = entry
+        self._local.move_to_end(key)
+        if len(self._local) > self.maxsize:
+            self._local.popitem(last=False)
+
+
+# Process-wide Redis client, created in the application lifespan when REDIS_URL is set
+_redis = None
+
+
+async def init_cache():
+    """
+    Connect to Redis if configured. Called once from the application lifespan.
+    """
+    global _redis
+    settings = get_settings()
+    if not settings.redis_url:
+        logger.info("REDIS_URL not set, using in-memory response cache")
+        return
+    if not REDIS_AVAILABLE:
+        logger.warning("REDIS_URL is set but the redis package is not installed, using in-memory response cache")
+        return
+    try:
+        _redis = aioredis.from_url(settings.redis_url)
+        await _redis.ping()
+        logger.info("Redis response cache connected")
+    except Exception as e:
+        logger.error(f"Redis connection failed, using in-memory response cache: {e}")
+        _redis = None
+
+
+async def close_cache():
+    """
+    Close the Redis connection on shutdown.
+    """
+    global _redis
+    if _redis is not None:
+        await _redis.close()
+        logger.info("Redis response cache closed")
+    _redis = None
+
+
+def get_redis():
+    return _redis
@@ -1,6 +1,6 @@
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from typing import List
-from functools import lru_cache
+from functools import cached_property, lru_cache
 import os
 
 
@@ -13,13 +13,26 @@ class Settings(BaseSettings):
     # Model settings
     blip_model: str = "Salesforce/blip-image-captioning-base"
     qa_model: str = "distilbert-base-cased-distilled-squad"
+    preload_models: bool = True  # load and warm up BLIP + QA during app startup
+    qa_max_seq_length: int = 384  # question + context token budget for the QA model
+    qa_jit_trace: bool = True  # trace the QA forward for the fixed qa_max_seq_length shape
+    quantize_models: bool = True  # dynamic INT8 quantization of BLIP + QA for CPU inference
+    compile_models: bool = True  # torch.compile the BLIP vision encoder (non-quantized models only)
+    torch_num_threads: int = 0  # 0 = half of the available cores
+    caption_batch_size: int = 8  # max images per batched BLIP call
+    caption_batch_wait_ms: int = 15  # max time to wait for a batch to fill
+    caption_cache_size: int = 1024  # captions cached by image content hash
+    qa_cache_size: int = 4096  # answers cached by (question, context) hash
+
+    ocr_workers: int = 2  # OCR worker processes per app worker; 0 runs OCR in threads instead
+    pdf_workers: int = 2  # Camelot worker processes per app worker; 0 or 1 parses pages in-process
 
     # CORS origins (raw string from env, e.g., "http://localhost:3000,http://127.0.0.1:5173")
     cors_origins: str = ""
 
-    @property
+    @cached_property
     def cors_origins_list(self) -> list[str]:
-        """Convert CORS origins string to a list."""
+        """Convert CORS origins string to a list (computed once; settings are frozen)."""
         return [origin.strip() for origin in self.cors_origins.split(",") if origin.strip()]
 
     # Server settings
@@ -45,10 +58,17 @@ class Settings(BaseSettings):
     # Storage settings
     UPLOAD_DIR: str = "uploads"
 
-    class Config:
-        env_prefix = ""   # no prefix needed (can read directly from .env)
-        env_file = ".env"
-        extra = "allow"
+    # Response cache settings
+    redis_url: str = ""  # e.g. redis://localhost:6379/0; in-memory cache when empty
+    search_cache_ttl: int = 60  # seconds a search result is served without hitting providers
+    search_cache_stale_ttl: int = 3600  # how long a result is kept as fallback when providers fail
+
+    model_config = SettingsConfigDict(
+        env_prefix="",    # no prefix needed (can read directly from .env)
+        env_file=".env",
+        extra="allow",
+        frozen=True,      # immutable, so derived values can be cached safely
+    )
 
 
 @lru_cache
@@ -0,0 +1,53 @@
+import aiohttp
+import logging
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Process-wide HTTP session so outbound calls reuse pooled keep-alive connections
+_session: Optional[aiohttp.ClientSession] = None
+
+
+def _create_session() -> aiohttp.ClientSession:
+    return aiohttp.ClientSession(
+        timeout=aiohttp.ClientTimeout(total=30),
+        connector=aiohttp.TCPConnector(
+            limit=100,
+            limit_per_host=20,
+            ttl_dns_cache=300,
+            keepalive_timeout=60
+        )
+    )
+
+
+async def init_http_session() -> aiohttp.ClientSession:
+    """
+    Create the shared session. Called once from the application lifespan.
+    """
+    global _session
+    if _session is None or _session.closed:
+        _session = _create_session()
+        logger.info("HTTP client session created")
+    return _session
+
+
+async def close_http_session():
+    """
+    Close the shared session and its connection pool on shutdown.
+    """
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+        logger.info("HTTP client session closed")
+    _session = None
+
+
+def get_http_session() -> aiohttp.ClientSession:
+    """
+    Return the shared session, creating it lazily when used outside the app lifespan.
+    Must be called from within a running event loop.
+    """
+    global _session
+    if _session is None or _session.closed:
+        _session = _create_session()
+    return _session
@@ -1,15 +1,28 @@
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers, MutableHeaders
+from fastapi.responses import JSONResponse, ORJSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from pydantic import BaseModel
 import aiohttp
 import re
-import os
 from urllib.parse import quote_plus
 import logging
 import time
+import zlib
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from contextlib import asynccontextmanager
+from typing import Optional
+
+from app.core.config import get_settings
+from app.core.http_client import init_http_session, close_http_session
+from app.core.cache import init_cache, close_cache
+from app.services.analysis_service import warmup_models
+from app.services.ocr_service import warmup_ocr
+from app.services.pdf_service import shutdown_table_pool
 
 # Import routers
 from app.api.routes.images import router as images_router
@@ -26,12 +39,8 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 # Config
-class Settings:
-    def __init__(self):
-        self.unsplash_access_key = os.getenv("UNSPLASH_ACCESS_KEY", "")
+settings = get_settings()
 
-def get_settings():
-    return Settings()
 # Lifespan events for startup/shutdown
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -41,9 +50,36 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting up Image Understanding MVP...")
     
-    # You can add model preloading here if needed
-    # from app.services.analysis_service import ensure_models
-    # ensure_models()  # Uncomment to preload models at startup
+    # Shared HTTP client session (connection pooling for outbound requests)
+    app.state.http = await init_http_session()
+
+    # Response cache (Redis when REDIS_URL is set, in-memory otherwise)
+    await init_cache()
+    
+    # OCR process pool: Tesseract/OpenCV/EasyOCR work is CPU-bound and holds the
+    # GIL for long stretches, so run it outside this worker's interpreter.
+    # spawn avoids forking a process that already has torch threads running
+    app.state.ocr_pool = None
+    if settings.ocr_workers > 0:
+        app.state.ocr_pool = ProcessPoolExecutor(
+            max_workers=settings.ocr_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=warmup_ocr
+        )
+        logger.info(f"OCR process pool started with {settings.ocr_workers} workers")
+    
+    # Preload and warm up the BLIP/QA models off the event loop so the
+    # first request doesn't pay for model loading or graph compilation
+    if settings.preload_models:
+        try:
+            await asyncio.to_thread(warmup_models)
+        except Exception as e:
+            logger.error(f"Model preloading failed, models will load on first request: {e}")
+        if app.state.ocr_pool is None:
+            try:
+                await asyncio.to_thread(warmup_ocr)
+            except Exception as e:
+                logger.error(f"OCR preloading failed, OCR engines will load on first request: {e}")
     
     logger.info("Application startup complete")
     
@@ -51,6 +87,11 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down Image Understanding MVP...")
+    await close_http_session()
+    await close_cache()
+    if app.state.ocr_pool is not None:
+        await asyncio.to_thread(app.state.ocr_pool.shutdown, cancel_futures=True)
+    await asyncio.to_thread(shutdown_table_pool)
     logger.info("Application shutdown complete")
 
 # Create FastAPI application
@@ -61,6 +102,7 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     openapi_url="/openapi.json",
+    default_response_class=ORJSONResponse,  # orjson serializes large result lists much faster
     lifespan=lifespan
 )
 
@@ -86,22 +128,114 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Request timing middleware
-@app.middleware("http")
-async def add_process_time_header(request: Request, call_next):
+# Response types that are already compressed (the /api/ocr-pdf ZIP, generated
+# PNGs) or opaque binary: gzipping them costs CPU for no size gain
+_NO_GZIP_TYPES = ("application/zip", "image/", "application/octet-stream")
+
+class TextGZipMiddleware:
+    """
+    Gzip text/JSON responses of at least `minimum_size` bytes. Bodies whose
+    content type is in _NO_GZIP_TYPES (or that are already encoded) pass
+    through untouched and keep their Content-Length.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, compresslevel: int = 5):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.compresslevel = compresslevel
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or "gzip" not in Headers(scope=scope).get("accept-encoding", ""):
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Optional[Message] = None
+        compressor = None
+        passthrough = False
+
+        async def send_maybe_gzip(message: Message):
+            nonlocal start_message, compressor, passthrough
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                passthrough = (
+                    "content-encoding" in headers
+                    or headers.get("content-type", "").startswith(_NO_GZIP_TYPES)
+                )
+                if passthrough:
+                    await send(message)
+                else:
+                    start_message = message  # held until the first body chunk decides
+                return
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            first_chunk = compressor is None
+            if first_chunk:
+                if not more_body and len(body) < self.minimum_size:
+                    passthrough = True
+                    await send(start_message)
+                    await send(message)
+                    return
+                # wbits 16+MAX_WBITS writes a gzip (not raw zlib) stream
+                compressor = zlib.compressobj(self.compresslevel, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+            data = compressor.compress(body) + (compressor.flush(zlib.Z_SYNC_FLUSH) if more_body else compressor.flush())
+            if first_chunk:
+                headers = MutableHeaders(raw=list(start_message["headers"]))
+                headers["Content-Encoding"] = "gzip"
+                headers.add_vary_header("Accept-Encoding")
+                if more_body:
+                    del headers["Content-Length"]
+                else:
+                    headers["Content-Length"] = str(len(data))
+                await send({**start_message, "headers": headers.raw})
+            await send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+        await self.app(scope, receive, send_maybe_gzip)
+
+# Compress larger text/JSON responses (search results, OCR text) at a moderate
+# level; ZIP, image and octet-stream bodies are sent as-is. Added after CORS so
+# it wraps the CORS layer and compresses the final response body
+app.add_middleware(TextGZipMiddleware, minimum_size=1024, compresslevel=5)
+
+# Request timing middleware (pure ASGI: avoids the extra task and
+# Request/Response wrapping that BaseHTTPMiddleware adds to every request)
+class ProcessTimeMiddleware:
     """
     Add processing time to response headers for monitoring.
     """
-    start_time = time.time()
-    response = await call_next(request)
-    process_time = time.time() - start_time
-    response.headers["X-Process-Time"] = str(process_time)
-    
-    # Log slow requests
-    if process_time > 5.0:  # Log requests taking more than 5 seconds
-        logger.warning(f"Slow request: {request.method} {request.url} took {process_time:.2f}s")
-    
-    return response
+
+    def __init__(self, app: ASGIApp, slow_request_threshold: float = 5.0):
+        self.app = app
+        self.slow_request_threshold = slow_request_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+
+        async def send_with_process_time(message: Message):
+            if message["type"] == "http.response.start":
+                process_time = time.perf_counter() - start_time
+                headers = list(message.get("headers", []))
+                headers.append((b"x-process-time", f"{process_time:.6f}".encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_process_time)
+        finally:
+            # Log slow requests
+            process_time = time.perf_counter() - start_time
+            if process_time > self.slow_request_threshold:
+                logger.warning(f"Slow request: {scope['method']} {scope['path']} took {process_time:.2f}s")
+
+app.add_middleware(ProcessTimeMiddleware)
 
 # Global exception handler
 @app.exception_handler(Exception)
@@ -200,9 +334,10 @@ async def dev_info():
         "python_version": sys.version,
         "platform": platform.platform(),
         "fastapi_version": "Check requirements.txt",
-        "run_command": "uvicorn app.main:app --reload --host 0.0.0.0 --port 8000",
+        "run_command": "uvicorn app.main:app --reload --host 0.0.0.0 --port 8000 --loop uvloop",
         "docs_url": "http://localhost:8000/docs"
     }
 
-# Run with: uvicorn app.main:app --reload --host 0.0.0.0 --port 8000
-# Or for production: gunicorn app.main:app -w 4 -k uvicorn.workers.UvicornWorker
\ No newline at end of file
+# Run with: uvicorn app.main:app --reload --host 0.0.0.0 --port 8000 --loop uvloop
+# Or for production: uvicorn app.main:app --host 0.0.0.0 --port 8000 --loop uvloop --workers ${WEB_CONCURRENCY:-4}
+#   (or gunicorn app.main:app -w ${WEB_CONCURRENCY:-4} -k uvicorn.workers.UvicornWorker)
\ No newline at end of file
@@ -5,6 +5,7 @@ from enum import Enum
 # Enums
 class ImageProvider(str, Enum):
     UNSPLASH = "unsplash"
+    DUCKDUCKGO = "duckduckgo"
 
 # Base models for reusability
 class BoundingBox(BaseModel):
@@ -80,12 +81,13 @@ class VQARequest(BaseModel):
     image_url: Optional[str] = None
     question: str
     ocr_text_hint: Optional[str] = None
+    return_context: bool = False  # echo the assembled context in the response
 
 class VQAResponse(BaseModel):
     caption: str
     answer: str
     confidence: Optional[float] = None
-    context_used: str
+    context_used: Optional[str] = None
     sources: List[Dict[str, Any]] = []
 
 # Error and Health models
@@ -2,15 +2,33 @@
 import aiohttp
 import asyncio
 import logging
-from typing import List, Dict, Optional
-from urllib.parse import quote_plus, unquote
+import re
+import time
+from typing import List, Dict, Optional, Tuple
+from urllib.parse import quote_plus
+from app.core.cache import ResponseCache
 from app.core.config import get_settings
+from app.core.http_client import get_http_session
 from app.models.schemas import ImageProvider
 
 logger = logging.getLogger(__name__)
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (compatible; ImageSearchMVP/1.0; +http://localhost)"
 }
+_DDG_VQD_RE = re.compile(r'vqd=["\']?([\d-]+)')
+
+# DuckDuckGo's image JSON endpoint needs a per-query "vqd" token taken from the
+# search page; cache it so repeat queries skip the HTML fetch
+DDG_VQD_TTL = 600
+DDG_VQD_CACHE_SIZE = 256
+_ddg_vqd_cache: Dict[str, Tuple[float, str]] = {}
+
+_settings = get_settings()
+_search_cache = ResponseCache(
+    "search",
+    ttl=_settings.search_cache_ttl,
+    stale_ttl=_settings.search_cache_stale_ttl
+)
 
 
 async def unsplash_search(session: aiohttp.ClientSession, q: str, limit: int) -> List[Dict]:
@@ -53,74 +71,131 @@ async def unsplash_search(session: aiohttp.ClientSession, q: str, limit: int) ->
     return results
 
 
-async def duckduckgo_search(session: aiohttp.ClientSession, q: str, limit: int) -> List[Dict]:
-    """Scrape DuckDuckGo image results (free fallback)."""
-    url = f"https://duckduckgo.com/?q={quote_plus(q)}&t=h_&iar=images&iax=images&ia=images"
-    ddg_img_re = r'imgurl=(.*?)&'
+async def _duckduckgo_vqd(session: aiohttp.ClientSession, q: str) -> Optional[str]:
+    """Get the vqd token for a query, from cache or the DuckDuckGo search page."""
+    cached = _ddg_vqd_cache.get(q)
+    if cached and time.monotonic() - cached[0] < DDG_VQD_TTL:
+        return cached[1]
+
+    url = f"https://duckduckgo.com/?q={quote_plus(q)}"
+    async with session.get(url, headers=HEADERS) as resp:
+        if resp.status != 200:
+            logger.error(f"DuckDuckGo returned status {resp.status}")
+            return None
+        html = await resp.text()
+
+    match = _DDG_VQD_RE.search(html)
+    if not match:
+        logger.warning("DuckDuckGo vqd token not found")
+        return None
 
+    if len(_ddg_vqd_cache) >= DDG_VQD_CACHE_SIZE:
+        _ddg_vqd_cache.pop(next(iter(_ddg_vqd_cache)))
+    _ddg_vqd_cache[q] = (time.monotonic(), match.group(1))
+    return match.group(1)
+
+
+async def duckduckgo_search(session: aiohttp.ClientSession, q: str, limit: int) -> List[Dict]:
+    """Search DuckDuckGo images via its JSON endpoint (free fallback)."""
     try:
-        async with session.get(url, headers=HEADERS) as resp:
+        vqd = await _duckduckgo_vqd(session, q)
+        if not vqd:
+            return []
+
+        params = {"l": "us-en", "o": "json", "q": q, "vqd": vqd, "f": ",,,", "p": "1"}
+        headers = {**HEADERS, "Accept": "application/json", "Referer": "https://duckduckgo.com/"}
+        async with session.get("https://duckduckgo.com/i.js", params=params, headers=headers) as resp:
             if resp.status != 200:
+                # Token expired or rejected; fetch a fresh one next time
+                _ddg_vqd_cache.pop(q, None)
                 logger.error(f"DuckDuckGo returned status {resp.status}")
                 return []
-            html = await resp.text()
+            data = await resp.json(content_type=None)
     except Exception as e:
-        logger.exception(f"DuckDuckGo scraping error: {e}")
+        logger.exception(f"DuckDuckGo search error: {e}")
         return []
 
-    import re
-    candidates = re.findall(ddg_img_re, html, re.IGNORECASE)
     items = []
     seen = set()
 
-    for c in candidates:
-        try:
-            c = unquote(c)
-            if not c.startswith("http") or c in seen:
-                continue
-            seen.add(c)
-            items.append({
-                "url": c,
-                "thumbnail": c,
-                "provider": ImageProvider.DUCKDUCKGO.value,
-                "title": None,
-                "license": "unknown",
-                "source_page": None,
-                "width": None,
-                "height": None,
-            })
-            if len(items) >= limit:
-                break
-        except Exception as e:
-            logger.warning(f"Skipping DuckDuckGo URL due to error: {e}")
+    for r in data.get("results", []):
+        url = r.get("image")
+        if not url or not url.startswith("http") or url in seen:
             continue
+        seen.add(url)
+        items.append({
+            "url": url,
+            "thumbnail": r.get("thumbnail") or url,
+            "provider": ImageProvider.DUCKDUCKGO.value,
+            "title": r.get("title"),
+            "license": "unknown",
+            "source_page": r.get("url"),
+            "width": r.get("width"),
+            "height": r.get("height"),
+        })
+        if len(items) >= limit:
+            break
 
     return items
 
 
-async def search_images(q: str, limit: int = 10, license_filter: Optional[str] = None) -> List[Dict]:
+async def search_images(
+    q: str,
+    limit: int = 10,
+    license_filter: Optional[str] = None,
+    session: Optional[aiohttp.ClientSession] = None
+) -> List[Dict]:
     """Main image search function using multiple providers."""
     if limit <= 0:
         return []
 
-    async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=30)) as session:
-        results = await unsplash_search(session, q, limit)
-
-        # If Unsplash fails or returns fewer images, try DuckDuckGo
-        if len(results) < limit:
-            ddg_results = await duckduckgo_search(session, q, limit)
-            results.extend(ddg_results)
-
-    # Deduplicate URLs
-    seen_urls = set()
-    deduped = []
-    for r in results:
-        if r["url"] not in seen_urls:
-            seen_urls.add(r["url"])
-            deduped.append(r)
+    cache_key = f"{q.strip().lower()}|{limit}|{license_filter or ''}"
+    cached, fresh = await _search_cache.get(cache_key)
+    if fresh:
+        return cached
+
+    # Query all providers concurrently over the shared session, so latency
+    # is the slowest provider rather than the sum of both
+    if session is None:
+        session = get_http_session()
+    unsplash_task = asyncio.create_task(unsplash_search(session, q, limit))
+    ddg_task = asyncio.create_task(duckduckgo_search(session, q, limit))
+
+    # If Unsplash alone fills the page, don't wait on DuckDuckGo
+    done, _ = await asyncio.wait({unsplash_task, ddg_task}, return_when=asyncio.FIRST_COMPLETED)
+    if (
+        unsplash_task in done
+        and not license_filter
+        and not unsplash_task.exception()
+        and len(unsplash_task.result()) >= limit
+    ):
+        ddg_task.cancel()
+        provider_results = [unsplash_task.result()]
+    else:
+        provider_results = await asyncio.gather(unsplash_task, ddg_task, return_exceptions=True)
+
+    # Deduplicate URLs (first occurrence wins, so Unsplash keeps priority)
+    deduped_by_url: Dict[str, Dict] = {}
+    for results in provider_results:
+        if isinstance(results, Exception):
+            logger.error(f"Image provider failed: {results}")
+            continue
+        for r in results:
+            deduped_by_url.setdefault(r["url"], r)
+    deduped = list(deduped_by_url.values())
 
     # Apply license filter if provided
     if license_filter:
         deduped = [r for r in deduped if (r.get("license") or "").startswith(license_filter)]
 
-    return deduped[:limit]
+    results = deduped[:limit]
+
+    # Providers swallow their errors and return nothing, so an empty result
+    # means upstream trouble: serve the last good response if we still have one
+    if not results and cached:
+        logger.warning(f"Image providers returned no results for {q!r}, serving stale cache")
+        return cached
+
+    if results:
+        await _search_cache.set(cache_key, results)
+    return results
@@ -1,31 +1,428 @@
 import camelot
+import contextlib
+import gc
+import hashlib
+import io
+import json
 import os
+import shutil
 import tempfile
+import threading
 import logging
-from typing import List, Dict, Optional, Tuple
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import chain, islice, repeat
+from typing import BinaryIO, Iterable, Iterator, List, Dict, Literal, Optional, Tuple, Union
 from pathlib import Path
+import numpy as np
 import pandas as pd
 import zipfile
 
+from app.core.config import get_settings
+
+try:
+    from pypdf import PdfReader
+    PDF_READER_AVAILABLE = True
+except ImportError:
+    try:
+        from PyPDF2 import PdfReader
+        PDF_READER_AVAILABLE = True
+    except ImportError:
+        PDF_READER_AVAILABLE = False
+
+try:
+    import pdfplumber
+    PDFPLUMBER_AVAILABLE = True
+except ImportError:
+    PDFPLUMBER_AVAILABLE = False
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+
+def _fast_to_csv(df: pd.DataFrame, path, include_header: bool = True):
+    """
+    Write a DataFrame (without its index) to CSV using pyarrow's C++ writer,
+    falling back to pandas when pyarrow is unavailable or can't convert the frame.
+    `path` may also be a writable binary file object.
+    """
+    if PYARROW_AVAILABLE:
+        try:
+            pacsv.write_csv(
+                pa.Table.from_pandas(df, preserve_index=False),
+                str(path) if isinstance(path, (str, os.PathLike)) else path,
+                write_options=pacsv.WriteOptions(include_header=include_header)
+            )
+            return
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError) as e:
+            logger.debug(f"pyarrow CSV write failed, using pandas: {e}")
+    if isinstance(path, (str, os.PathLike)):
+        with open(path, 'wb', buffering=1 << 20) as f:
+            _fast_to_csv(df, f, include_header=include_header)
+        return
+    text = io.TextIOWrapper(path, encoding="utf-8", newline="", write_through=True)
+    try:
+        df.to_csv(text, index=False, header=include_header)
+    finally:
+        text.detach()  # leave the underlying binary stream open for the caller
+
+
+def _with_str_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Feather/Parquet require string column names (Camelot uses integers)."""
+    return df.rename(columns=str)
+
+
+# Table writers by output format: fn(df, path, include_header). Feather and
+# Parquet are columnar binary formats and skip per-cell stringification
+TableFormat = Literal["csv", "feather", "parquet"]
+_TABLE_WRITERS = {
+    "csv": _fast_to_csv,
+    "feather": lambda df, path, include_header=True: _with_str_columns(df).to_feather(path, compression="lz4"),
+    "parquet": lambda df, path, include_header=True: _with_str_columns(df).to_parquet(path, compression="snappy", index=False),
+}
+
+
+def _table_writer(fmt: str):
+    if fmt not in _TABLE_WRITERS:
+        raise ValueError(f"Unknown table format: {fmt}. Available: {list(_TABLE_WRITERS.keys())}")
+    return _TABLE_WRITERS[fmt]
+
+
+def _batched(items: Iterable, size: int) -> Iterator[list]:
+    """Yield lists of up to `size` items (itertools.batched needs Python 3.12)."""
+    it = iter(items)
+    while batch := list(islice(it, size)):
+        yield batch
+
+
+def _map_in_threads(fn, items: Iterable, max_workers: int = 8) -> list:
+    """
+    Apply fn to every item on a small thread pool, returning results in input order.
+    Used for file writes, which release the GIL inside pandas/pyarrow/zlib.
+    Items are pulled `max_workers` at a time, so a lazy iterable of DataFrames
+    is never fully materialised.
+    """
+    results = []
+    with contextlib.ExitStack() as stack:
+        executor = None
+        for batch in _batched(items, max_workers):
+            if executor is None and len(batch) == 1:
+                results.append(fn(batch[0]))
+                continue
+            if executor is None:
+                executor = stack.enter_context(ThreadPoolExecutor(max_workers=max_workers))
+            results.extend(executor.map(fn, batch))
+    return results
+
+
+def _pdf_page_count(path: str) -> int:
+    """Return the number of pages in a PDF, or 0 if it can't be determined."""
+    if not PDF_READER_AVAILABLE:
+        return 0
+    try:
+        return len(PdfReader(path).pages)
+    except Exception as e:
+        logger.warning(f"Could not read page count of {path}: {e}")
+        return 0
+
+
+def _candidate_pages(path: str, flavor: str) -> Optional[List[int]]:
+    """
+    Cheap pre-pass listing the pages that could hold a table: ruling lines,
+    rectangles or curves for lattice, a minimum amount of text for stream.
+    Pages that fail this can't yield tables, so Camelot's layout analysis is
+    skipped for them. Returns None when pdfplumber is unavailable or the
+    pre-pass fails, and [] when no page can hold a table.
+    """
+    if not PDFPLUMBER_AVAILABLE:
+        return None
+    try:
+        candidates = []
+        with pdfplumber.open(path) as pdf:
+            for i, page in enumerate(pdf.pages, 1):
+                if flavor == "lattice":
+                    if page.lines or page.rects or page.curves:
+                        candidates.append(i)
+                elif len(page.chars) >= 8:
+                    candidates.append(i)
+                page.close()  # drop the per-page object cache
+        return candidates
+    except Exception as e:
+        logger.warning(f"Candidate page scan failed for {path}: {e}")
+        return None
+
+
+def _extract_one_page(path: str, page: int, flavor: str) -> list:
+    """Run Camelot on a single page (module-level so it can run in a worker process)."""
+    return list(camelot.read_pdf(path, pages=str(page), flavor=flavor))
+
+
+# Shared Camelot worker pool, created on first use so every request draws from
+# the same bounded set of processes (spawn: each worker pays for its own
+# interpreter and camelot import once, not per request)
+PDF_PARALLEL_MIN_PAGES = 8  # below this a single read_pdf beats dispatching to workers
+_table_pool: Optional[ProcessPoolExecutor] = None
+_table_pool_lock = threading.Lock()
+_in_table_worker = False
+
+
+def _mark_table_worker():
+    """Pool initializer: code running in a worker parses serially instead of nesting a pool."""
+    global _in_table_worker
+    _in_table_worker = True
+
+
+def _get_table_pool() -> Optional[ProcessPoolExecutor]:
+    """Return the shared worker pool, or None when parsing should stay in this process."""
+    global _table_pool
+    if _in_table_worker:
+        return None
+    workers = get_settings().pdf_workers
+    if workers <= 1:
+        return None
+    with _table_pool_lock:
+        if _table_pool is None:
+            _table_pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_mark_table_worker
+            )
+            logger.info(f"PDF table worker pool started with {workers} workers")
+        return _table_pool
+
+
+def _discard_table_pool(pool: ProcessPoolExecutor):
+    """Drop a broken pool so the next call starts a fresh one."""
+    global _table_pool
+    with _table_pool_lock:
+        if _table_pool is pool:
+            _table_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_table_pool():
+    """Stop the shared Camelot worker pool. Called from the application lifespan."""
+    global _table_pool
+    with _table_pool_lock:
+        pool, _table_pool = _table_pool, None
+    if pool is not None:
+        pool.shutdown(cancel_futures=True)
+
+
+def _iter_tables(path: str, pages: str = "all", flavor: str = "stream", chunk: int = 10) -> Iterator:
+    """
+    Yield Camelot tables in page order, parsing `chunk` pages at a time so only
+    one chunk of Table objects is alive at once. For documents of at least
+    PDF_PARALLEL_MIN_PAGES pages, pages within a chunk run on the shared worker
+    pool (processes rather than threads because Ghostscript, used by the
+    lattice flavor, is not thread-safe).
+    For "all", pages that can't contain a table are skipped (see _candidate_pages);
+    an explicit page selection is parsed as a single chunk.
+    """
+    if pages != "all":
+        yield from camelot.read_pdf(path, pages=pages, flavor=flavor)
+        return
+
+    page_list = _candidate_pages(path, flavor)
+    if page_list is None:
+        page_list = list(range(1, _pdf_page_count(path) + 1))
+    elif not page_list:
+        logger.info(f"No page in {path} can hold a {flavor} table, skipping Camelot")
+        return
+    else:
+        logger.info(f"{len(page_list)} candidate table pages in {path}")
+    if not page_list:
+        # Page count unknown: let Camelot handle the whole document
+        yield from camelot.read_pdf(path, pages="all", flavor=flavor)
+        return
+
+    executor = _get_table_pool() if len(page_list) >= PDF_PARALLEL_MIN_PAGES else None
+    if executor is not None:
+        logger.info(f"Extracting {len(page_list)} pages on the worker pool")
+    for start in range(0, len(page_list), chunk):
+        chunk_pages = page_list[start:start + chunk]
+        if executor is None:
+            chunk_tables = list(camelot.read_pdf(path, pages=",".join(map(str, chunk_pages)), flavor=flavor))
+        else:
+            try:
+                chunk_tables = [
+                    table
+                    for page_tables in executor.map(_extract_one_page, repeat(path), chunk_pages, repeat(flavor))
+                    for table in page_tables
+                ]
+            except BrokenProcessPool:
+                # A crashed worker breaks the pool; start a fresh one next time
+                _discard_table_pool(executor)
+                raise
+        yield from chunk_tables
+        del chunk_tables
+        gc.collect()
+
+
+# Content-addressed cache of Camelot results: <dir>/<sha256>/<flavor>_<pages>/
+# holds one CSV per table plus a manifest.json with the per-table metadata.
+# Opt-in (it keeps the contents of uploaded PDFs and has no eviction): disabled
+# unless PDF_TABLE_CACHE_DIR is set
+PDF_TABLE_CACHE_DIR = Path(os.environ["PDF_TABLE_CACHE_DIR"]) if os.getenv("PDF_TABLE_CACHE_DIR") else None
+
+
+def _pdf_fingerprint(path: str) -> str:
+    """SHA-256 of the PDF contents, read in 1 MiB chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(1 << 20):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _cache_entry_dir(fingerprint: str, pages: str, flavor: str) -> Path:
+    safe_pages = "".join(c if c.isalnum() or c in "-," else "_" for c in pages)
+    return PDF_TABLE_CACHE_DIR / fingerprint / f"{flavor}_{safe_pages}"
+
+
+def _load_cached_manifest(fingerprint: str, pages: str, flavor: str) -> Optional[List[Dict]]:
+    """Return the cached per-table metadata (with absolute CSV paths), or None on a miss."""
+    entry_dir = _cache_entry_dir(fingerprint, pages, flavor)
+    try:
+        with open(entry_dir / "manifest.json", "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable table cache entry {entry_dir}: {e}")
+        return None
+
+    for table in manifest:
+        table["csv"] = str(entry_dir / table["csv"])
+        table["shape"] = tuple(table["shape"]) if table.get("shape") else None
+    return manifest
+
+
+def _store_cached_tables(fingerprint: str, pages: str, flavor: str, tables: Iterable) -> Optional[List[Dict]]:
+    """
+    Write Camelot tables into the cache as they are produced. The entry is
+    built in a temp dir and renamed into place so readers never see a partial
+    entry. Only cache I/O failures are handled here; errors raised by the
+    `tables` iterator (i.e. by Camelot) propagate to the caller.
+    Returns the stored manifest (as from _load_cached_manifest), or None if caching failed.
+    """
+    entry_dir = _cache_entry_dir(fingerprint, pages, flavor)
+    try:
+        entry_dir.parent.mkdir(parents=True, exist_ok=True)
+        tmp_dir = Path(tempfile.mkdtemp(dir=entry_dir.parent, prefix=".tmp_"))
+    except OSError as e:
+        logger.warning(f"Failed to cache extracted tables: {e}")
+        return None
+
+    try:
+        manifest = []
+        for i, table in enumerate(tables):
+            record = _table_record(table, i)
+            csv_name = f"table_{i}.csv"
+            try:
+                # Header-less like camelot's Table.to_csv
+                _fast_to_csv(record.pop("dataframe"), tmp_dir / csv_name, include_header=False)
+            except OSError as e:
+                logger.warning(f"Failed to cache extracted tables: {e}")
+                return None
+            manifest.append({"csv": csv_name, **record})
+        try:
+            with open(tmp_dir / "manifest.json", "w", encoding="utf-8") as f:
+                json.dump(manifest, f)
+        except OSError as e:
+            logger.warning(f"Failed to cache extracted tables: {e}")
+            return None
+        try:
+            os.rename(tmp_dir, entry_dir)
+        except OSError:
+            pass  # another worker stored the same entry first
+    finally:
+        # Removes the temp dir unless it was renamed into place (failed write,
+        # lost race or Camelot error)
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    return _load_cached_manifest(fingerprint, pages, flavor)
+
+
+def _read_cached_csv(csv_path: str) -> pd.DataFrame:
+    """Load a cached table back into the same all-string, integer-labelled frame Camelot returns."""
+    try:
+        return pd.read_csv(csv_path, header=None, dtype=str, keep_default_na=False)
+    except pd.errors.EmptyDataError:
+        return pd.DataFrame()
+
+
+def _table_record(table, table_index: int) -> Dict:
+    """Per-table dict handed to callers: the DataFrame plus Camelot's metadata."""
+    return {
+        "dataframe": table.df,
+        "table_index": table_index,
+        "page": table.page,
+        "accuracy": round(table.accuracy, 2) if hasattr(table, 'accuracy') else None,
+        "shape": table.shape if hasattr(table, 'shape') else None,
+        "whitespace": round(table.whitespace, 2) if hasattr(table, 'whitespace') else None
+    }
+
+
+def _iter_table_records(path: str, pages: str, flavor: str) -> Iterator[Dict]:
+    """
+    Yield Camelot tables as record dicts in table order, served from the disk
+    cache (keyed by the PDF contents, pages and flavor) when PDF_TABLE_CACHE_DIR
+    is set. Records are produced lazily, so a caller that handles one table at
+    a time never holds the whole document's DataFrames.
+    """
+    if PDF_TABLE_CACHE_DIR is not None:
+        fingerprint = _pdf_fingerprint(path)
+        manifest = _load_cached_manifest(fingerprint, pages, flavor)
+        if manifest is None:
+            logger.info(f"Extracting tables from {path}")
+            # Tables are written to the cache chunk by chunk as Camelot produces
+            # them, so the Table objects for the whole document never coexist
+            manifest = _store_cached_tables(fingerprint, pages, flavor, _iter_tables(path, pages=pages, flavor=flavor))
+        else:
+            logger.info(f"Table cache hit for {path} ({flavor}, pages={pages})")
+        if manifest is not None:
+            for table in manifest:
+                yield {"dataframe": _read_cached_csv(table.pop("csv")), **table}
+            return
+        # Cache not writable; serve straight from Camelot
+
+    for i, table in enumerate(_iter_tables(path, pages=pages, flavor=flavor)):
+        yield _table_record(table, i)
+
+
 def extract_tables_from_pdf(
     path: str, 
     output_dir: Optional[str] = None,
     pages: str = "all",
-    flavor: str = "stream"
+    flavor: str = "stream",
+    fmt: TableFormat = "csv"
 ) -> List[Dict[str, str]]:
     """
-    Extract tables from a PDF file and save them to CSV.
+    Extract tables from a PDF file and save them to CSV (or Feather/Parquet).
     
     Args:
         path: Path to the PDF file
         output_dir: Directory to save CSV files (if None, uses temp directory)
         pages: Pages to extract from ("all", "1,2,3", "1-3", etc.)
         flavor: Camelot flavor ("stream" or "lattice")
+        fmt: Output format ("csv", "feather" or "parquet")
     
     Returns:
-        List of dictionaries with table information:
+        List of dictionaries with table information (csv_path holds the
+        written file for every format):
         [{"csv_path": "path/to/table_0.csv", "accuracy": 95.2, "page": 1}, ...]
     """
     try:
@@ -35,47 +432,45 @@ def extract_tables_from_pdf(
         if not path.lower().endswith('.pdf'):
             raise ValueError("File must be a PDF")
         
+        write_table = _table_writer(fmt)
+        
         if output_dir is None:
             output_dir = tempfile.mkdtemp()
         else:
             os.makedirs(output_dir, exist_ok=True)
         
-        logger.info(f"Extracting tables from {path} using {flavor} flavor")
-        tables = camelot.read_pdf(path, pages=pages, flavor=flavor)
+        # Filename prefix computed once, not per table
+        prefix = os.path.join(output_dir, Path(path).stem)
         
-        if not tables:
-            logger.warning(f"No tables found in PDF: {path}")
-            return []
-        
-        logger.info(f"Found {len(tables)} tables")
-        
-        csv_data = []
+        # Shared Camelot pass; with PDF_TABLE_CACHE_DIR set, repeat calls for the
+        # same PDF, pages and flavor reuse it instead of parsing the PDF again
+        logger.info(f"Extracting tables from {path} using {flavor} flavor")
+        tables = _iter_table_records(path, pages, flavor)
         
-        for i, table in enumerate(tables):
+        def _save_one(table: Dict) -> Optional[Dict]:
+            i = table["table_index"]
             try:
-                pdf_name = Path(path).stem
-                csv_filename = f"{pdf_name}_table_{i}.csv"
-                csv_path = os.path.join(output_dir, csv_filename)
-                
-                table.to_csv(csv_path)
+                csv_path = f"{prefix}_table_{i}.{fmt}"
                 
-                table_info = {
-                    "csv_path": csv_path,
-                    "table_index": i,
-                    "page": table.page,
-                    "accuracy": round(table.accuracy, 2) if hasattr(table, 'accuracy') else None,
-                    "shape": table.shape if hasattr(table, 'shape') else None,
-                    "whitespace": round(table.whitespace, 2) if hasattr(table, 'whitespace') else None
-                }
+                write_table(table.pop("dataframe"), csv_path, include_header=False)
                 
-                csv_data.append(table_info)
-                logger.info(f"Saved table {i} (page {table.page}) to {csv_path}")
+                logger.info(f"Saved table {i} (page {table['page']}) to {csv_path}")
+                return {"csv_path": csv_path, **table}
                 
             except Exception as e:
                 logger.error(f"Failed to save table {i}: {e}")
-                continue
+                return None
+        
+        # Write the tables concurrently as they are extracted; results come
+        # back in table order
+        csv_data = _map_in_threads(_save_one, tables)
+        
+        if not csv_data:
+            logger.warning(f"No tables found in PDF: {path}")
+            return []
         
-        return csv_data
+        logger.info(f"Found {len(csv_data)} tables")
+        return [info for info in csv_data if info is not None]
         
     except Exception as e:
         logger.error(f"Failed to extract tables from PDF: {e}")
@@ -92,25 +487,7 @@ def extract_tables_to_dataframes(
         if not os.path.exists(path):
             raise FileNotFoundError(f"PDF file not found: {path}")
         
-        logger.info(f"Extracting tables from {path}")
-        tables = camelot.read_pdf(path, pages=pages, flavor=flavor)
-        
-        if not tables:
-            return []
-        
-        table_data = []
-        
-        for i, table in enumerate(tables):
-            table_info = {
-                "dataframe": table.df,
-                "table_index": i,
-                "page": table.page,
-                "accuracy": round(table.accuracy, 2) if hasattr(table, 'accuracy') else None,
-                "shape": table.shape if hasattr(table, 'shape') else None
-            }
-            table_data.append(table_info)
-        
-        return table_data
+        return list(_iter_table_records(path, pages, flavor))
         
     except Exception as e:
         logger.error(f"Failed to extract tables: {e}")
@@ -120,23 +497,42 @@ def extract_tables_to_dataframes(
 def extract_best_tables(
     path: str,
     min_accuracy: float = 80.0,
-    output_dir: Optional[str] = None
+    output_dir: Optional[str] = None,
+    fmt: TableFormat = "csv"
 ) -> List[Dict[str, str]]:
     """Extract only high-quality tables based on accuracy threshold."""
     try:
+        write_table = _table_writer(fmt)
+        
         stream_tables = []
         lattice_tables = []
         
+        # The two flavors are independent, so run them side by side on the shared
+        # worker pool (pdfminer is GIL-bound, Ghostscript isn't thread-safe).
+        # Inside a worker each flavor parses its pages serially, so pools don't nest
+        executor = _get_table_pool()
+        if executor is not None:
+            f_stream = executor.submit(extract_tables_to_dataframes, path, "all", "stream")
+            f_lattice = executor.submit(extract_tables_to_dataframes, path, "all", "lattice")
+            get_stream, get_lattice = f_stream.result, f_lattice.result
+        else:
+            get_stream = lambda: extract_tables_to_dataframes(path, "all", "stream")
+            get_lattice = lambda: extract_tables_to_dataframes(path, "all", "lattice")
+        
         try:
-            stream_tables = extract_tables_to_dataframes(path, flavor="stream")
+            stream_tables = get_stream()
         except Exception as e:
             logger.warning(f"Stream flavor failed: {e}")
         
         try:
-            lattice_tables = extract_tables_to_dataframes(path, flavor="lattice")
+            lattice_tables = get_lattice()
         except Exception as e:
             logger.warning(f"Lattice flavor failed: {e}")
         
+        if executor is not None and any(isinstance(f.exception(), BrokenProcessPool) for f in (f_stream, f_lattice)):
+            # A crashed worker breaks the pool; start a fresh one next time
+            _discard_table_pool(executor)
+        
         all_tables = []
         
         for tables, flavor in [(stream_tables, "stream"), (lattice_tables, "lattice")]:
@@ -145,7 +541,11 @@ def extract_best_tables(
                     table["flavor"] = flavor
                     all_tables.append(table)
         
-        all_tables.sort(key=lambda x: x["accuracy"] or 0, reverse=True)
+        # Sort by accuracy (descending) with a stable argsort over a key array
+        accuracies = np.fromiter(
+            (t["accuracy"] or 0.0 for t in all_tables), dtype=np.float64, count=len(all_tables)
+        )
+        all_tables = [all_tables[i] for i in np.argsort(-accuracies, kind='stable')]
         
         if not all_tables:
             logger.warning("No high-quality tables found")
@@ -156,64 +556,180 @@ def extract_best_tables(
         else:
             os.makedirs(output_dir, exist_ok=True)
         
-        saved_tables = []
-        pdf_name = Path(path).stem
+        prefix = os.path.join(output_dir, Path(path).stem)
         
-        for i, table in enumerate(all_tables):
-            csv_filename = f"{pdf_name}_best_table_{i}.csv"
-            csv_path = os.path.join(output_dir, csv_filename)
+        def _save_one(indexed_table) -> Dict:
+            i, table = indexed_table
+            csv_path = f"{prefix}_best_table_{i}.{fmt}"
             
-            table["dataframe"].to_csv(csv_path, index=False)
+            # Drop the DataFrame as soon as it's written so it isn't pinned by all_tables
+            df = table.pop("dataframe")
+            write_table(df, csv_path)
+            del df
             
-            saved_tables.append({
+            return {
                 "csv_path": csv_path,
                 "page": table["page"],
                 "accuracy": table["accuracy"],
                 "flavor": table["flavor"],
                 "shape": table["shape"]
-            })
+            }
         
-        return saved_tables
+        # Write the tables concurrently; results come back in accuracy order
+        return _map_in_threads(_save_one, list(enumerate(all_tables)))
         
     except Exception as e:
         logger.error(f"Failed to extract best tables: {e}")
         raise
 
 
+def extract_tables_to_zip(
+    path: str,
+    zip_target: Union[str, BinaryIO],
+    pages: str = "all",
+    flavor: str = "stream",
+    compression: int = zipfile.ZIP_DEFLATED
+) -> List[Dict[str, any]]:
+    """
+    Extract tables from a PDF and write each one as a CSV member of a ZIP,
+    encoding straight into the archive without intermediate CSV files.
+    
+    Args:
+        path: Path to the PDF file
+        zip_target: ZIP file path or writable binary file object (e.g. BytesIO)
+        pages: Pages to extract from ("all", "1,2,3", "1-3", etc.)
+        flavor: Camelot flavor ("stream" or "lattice")
+        compression: zipfile compression method (DEFLATE uses level 1)
+    
+    Returns:
+        List of dictionaries with table information ("arcname" is the ZIP member name);
+        empty (and nothing written) when the PDF has no tables
+    """
+    try:
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"PDF file not found: {path}")
+        
+        # Tables are encoded one at a time as they are extracted; peek at the
+        # first so nothing is written when the PDF has none
+        tables = _iter_table_records(path, pages, flavor)
+        first = next(tables, None)
+        if first is None:
+            logger.warning(f"No tables found in PDF: {path}")
+            return []
+        
+        pdf_name = Path(path).stem
+        zipped = []
+        with contextlib.ExitStack() as stack:
+            if isinstance(zip_target, (str, os.PathLike)):
+                # Large buffer: the ZIP writer issues many small writes
+                zip_target = stack.enter_context(open(zip_target, 'wb', buffering=8 << 20))
+            zipf = stack.enter_context(
+                zipfile.ZipFile(zip_target, 'w', compression, compresslevel=1, allowZip64=True)
+            )
+            for table in chain([first], tables):
+                arcname = f"{pdf_name}_table_{table['table_index']}.csv"
+                with zipf.open(arcname, 'w', force_zip64=True) as dst:
+                    # Header-less, like camelot's Table.to_csv
+                    _fast_to_csv(table.pop("dataframe"), dst, include_header=False)
+                zipped.append({"arcname": arcname, **table})
+        
+        logger.info(f"Wrote {len(zipped)} tables to ZIP")
+        return zipped
+    
+    except Exception as e:
+        logger.error(f"Failed to extract tables to ZIP: {e}")
+        raise
+
+
 def cleanup_temp_files(csv_paths: List[str]):
     """Clean up temporary CSV files."""
     for csv_path in csv_paths:
+        # Remove directly instead of stat-then-unlink; a missing file is fine
         try:
-            if os.path.exists(csv_path):
-                os.remove(csv_path)
-                logger.info(f"Cleaned up {csv_path}")
+            os.remove(csv_path)
+            logger.info(f"Cleaned up {csv_path}")
+        except FileNotFoundError:
+            pass
         except Exception as e:
             logger.warning(f"Failed to cleanup {csv_path}: {e}")
 
 
+# Opt-in Numba kernel for the analysis summary; only worth the JIT cost on
+# PDFs with hundreds of tables
+PDF_ANALYZE_NUMBA = os.getenv("PDF_ANALYZE_NUMBA", "").lower() in ("1", "true", "yes")
+PDF_ANALYZE_NUMBA_MIN_TABLES = 200
+
+
+def _first_row_value_counts(dataframes: List[pd.DataFrame]) -> np.ndarray:
+    """
+    For each DataFrame, the number of non-missing values in its first row.
+    First rows are stacked into one NaN-padded matrix so the check is a single
+    vectorised isna/sum instead of one Series per table. Empty frames give 0.
+    """
+    width = max((df.shape[1] for df in dataframes), default=0)
+    first_rows = np.full((len(dataframes), width), np.nan, dtype=object)
+    for i, df in enumerate(dataframes):
+        if df.shape[0] and df.shape[1]:
+            first_rows[i, :df.shape[1]] = df.to_numpy()[0]  # single object block: row 0 is a view
+    return (~pd.isna(first_rows)).sum(axis=1).astype(np.int64)
+
+
+def _summarize_tables(shapes: np.ndarray, accs: np.ndarray, value_counts: np.ndarray) -> Tuple[float, np.ndarray]:
+    """Accuracy total and has-headers mask from (rows, columns) shapes and first-row value counts."""
+    has_headers = (shapes[:, 0] > 0) & (shapes[:, 1] > 0) & (value_counts > 0)
+    return float(accs.sum()), has_headers
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _summarize_tables_jit(shapes, accs, value_counts):
+        """Single compiled loop equivalent of _summarize_tables."""
+        n = shapes.shape[0]
+        has_headers = np.zeros(n, dtype=np.bool_)
+        accuracy_sum = 0.0
+        for i in range(n):
+            accuracy_sum += accs[i]
+            has_headers[i] = shapes[i, 0] > 0 and shapes[i, 1] > 0 and value_counts[i] > 0
+        return accuracy_sum, has_headers
+
+
 def extract_and_analyze_tables(pdf_path: str) -> Dict[str, any]:
     """Extract tables and return analysis summary."""
     try:
         tables = extract_tables_to_dataframes(pdf_path)
         
-        summary = {
-            "total_tables": len(tables),
-            "pages_with_tables": list(set([t["page"] for t in tables])),
-            "average_accuracy": sum([t["accuracy"] or 0 for t in tables]) / len(tables) if tables else 0,
-            "tables": []
-        }
+        # Numeric aggregation runs on flat arrays; the loop below only assembles dicts
+        dataframes = [t["dataframe"] for t in tables]
+        shapes = np.array([df.shape for df in dataframes], dtype=np.int64).reshape(-1, 2)
+        accs = np.array([t["accuracy"] or 0 for t in tables], dtype=np.float64)
+        value_counts = _first_row_value_counts(dataframes)
+        
+        summarize = _summarize_tables
+        if NUMBA_AVAILABLE and PDF_ANALYZE_NUMBA and len(tables) > PDF_ANALYZE_NUMBA_MIN_TABLES:
+            summarize = _summarize_tables_jit
+        accuracy_sum, has_headers = summarize(shapes, accs, value_counts)
         
-        for table in tables:
+        pages = set()
+        table_summaries = []
+        
+        for table, (rows, columns), table_has_headers in zip(tables, shapes.tolist(), has_headers.tolist()):
             df = table["dataframe"]
-            table_summary = {
+            pages.add(table["page"])
+            table_summaries.append({
                 "page": table["page"],
                 "accuracy": table["accuracy"],
-                "rows": len(df),
-                "columns": len(df.columns),
-                "has_headers": len(df.columns) > 0 and not df.iloc[0].isna().all(),
-                "preview": df.head(3).to_dict() if not df.empty else {}
-            }
-            summary["tables"].append(table_summary)
+                "rows": rows,
+                "columns": columns,
+                "has_headers": table_has_headers,
+                "preview": df.iloc[:3].to_dict(orient='list') if not df.empty else {}
+            })
+        
+        summary = {
+            "total_tables": len(tables),
+            "pages_with_tables": sorted(pages, key=int),
+            "average_accuracy": accuracy_sum / len(tables) if tables else 0,
+            "tables": table_summaries
+        }
         
         return summary
         
@@ -241,10 +757,16 @@ def download_csv_files(csv_info: List[Dict[str, str]], zip_path: Optional[str] =
         if zip_path is None:
             zip_path = os.path.join(tempfile.gettempdir(), "extracted_tables.zip")
         
-        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
+        # Fastest DEFLATE level: CSV still compresses well and the CPU cost drops sharply.
+        # Members are streamed in 1 MiB blocks so memory stays flat regardless of file size
+        # Large buffer: the ZIP writer issues many small writes
+        with open(zip_path, 'wb', buffering=8 << 20) as raw, \
+                zipfile.ZipFile(raw, 'w', zipfile.ZIP_DEFLATED, compresslevel=1, allowZip64=True) as zipf:
             for item in csv_info:
                 if "csv_path" in item and os.path.exists(item["csv_path"]):
-                    zipf.write(item["csv_path"], arcname=os.path.basename(item["csv_path"]))
+                    arcname = os.path.basename(item["csv_path"])
+                    with open(item["csv_path"], 'rb') as src, zipf.open(arcname, 'w', force_zip64=True) as dst:
+                        shutil.copyfileobj(src, dst, length=1 << 20)
         
         logger.info(f"Packaged CSVs into ZIP: {zip_path}")
         return zip_path